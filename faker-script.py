@@ -6,7 +6,7 @@
 #       extension: .py
 #       format_name: percent
 #       format_version: '1.3'
-#       jupytext_version: 1.18.1
+#       jupytext_version: 1.19.5
 #   kernelspec:
 #     display_name: .venv
 #     language: python
@@ -33,20 +33,19 @@
 # # Configuration & Parameters
 
 # %% colab={"base_uri": "https://localhost:8080/"} id="_9D_di66EMVe" outputId="dbc85c12-0906-44f5-b1e5-29e64e203f1f"
-# %pip install faker pandas numpy
+# %pip install mimesis pandas numpy pyarrow
 import pandas as pd
 import numpy as np
-from faker import Faker
-import random
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from mimesis import Finance
+import concurrent.futures
+import multiprocessing
 import os
-from datetime import timedelta, date
 
 # %% id="r-qa-rjmE1Zf"
 seed = 42 # for reproducible random output across runs
-fake = Faker()
-Faker.seed(seed)
-np.random.seed(seed)
-random.seed(seed)
+rng = np.random.default_rng(seed)
 
 # %% [markdown] id="pH6MHJlpHZsu"
 # ## Volume Constraints
@@ -94,29 +93,42 @@ COUNTRY_WEIGHTS = {
 # - TODO Review Attributes: Why are tier category / risk & capacity needed?
 
 # %% colab={"base_uri": "https://localhost:8080/", "height": 258} id="23I495KNHMX3" outputId="83da386f-7ee6-480b-bb88-e6d9a0023e27"
-suppliers = []
-countries = list(COUNTRY_WEIGHTS.keys())
-weights = list(COUNTRY_WEIGHTS.values())
-
-# We assign a 'capability_score' which determines how many materials they can supply
-dominance_scores = np.random.zipf(a=1.5, size=NUM_SUPPLIERS)
-# Normalize scores to a realistic capacity (max 50 materials per supplier for hubs)
-dominance_scores = (dominance_scores / dominance_scores.max()) * 50
-dominance_scores = np.maximum(dominance_scores, 1).astype(int)
-
-for i in range(NUM_SUPPLIERS):
-    country = random.choices(countries, weights=weights, k=1)[0]
-    sup_id = f"SUP_{country}_{str(i+1).zfill(5)}"
-
-    suppliers.append({
-        "supplier_id": sup_id,
-        "name": fake.company(),
-        "country": country,
-        "capacity_score": int(dominance_scores[i]) # Hidden attribute for graph generation logic
-    })
+def build_suppliers(worker_seed):
+    # Runs in a worker process, so it seeds its own generators deterministically
+    worker_finance = Finance(seed=worker_seed)
+    worker_rng = np.random.default_rng(worker_seed)
+
+    countries = list(COUNTRY_WEIGHTS.keys())
+    weights = list(COUNTRY_WEIGHTS.values())
+
+    # We assign a 'capability_score' which determines how many materials they can supply
+    dominance_scores = worker_rng.zipf(a=1.5, size=NUM_SUPPLIERS)
+    # Normalize scores to a realistic capacity (max 50 materials per supplier for hubs)
+    dominance_scores = (dominance_scores / dominance_scores.max()) * 50
+    dominance_scores = np.maximum(dominance_scores, 1).astype(int)
+
+    # Generate all names in one pass instead of interleaving per row
+    company_names = [worker_finance.company() for _ in range(NUM_SUPPLIERS)]
+    # Batched integer-form choice; indexing into the label list stays per row
+    country_codes = worker_rng.choice(len(countries), size=NUM_SUPPLIERS, p=weights)
+    supplier_countries = np.array(countries)[country_codes]
+
+    # Build all ids in one vectorized string pass instead of 3000 f-strings
+    supplier_ids = np.char.add(
+        np.char.add('SUP_', supplier_countries),
+        np.char.add('_', np.char.zfill(np.arange(1, NUM_SUPPLIERS + 1).astype('U5'), 5))
+    )
 
-df_suppliers = pd.DataFrame(suppliers)
-df_suppliers.head()
+    # Assemble straight from the column arrays, no per-row dicts;
+    # country has 6 distinct values, so categorical codes instead of strings.
+    # capacity_score stays in the dominance_scores array: it only steers
+    # graph generation and is never exported
+    df = pd.DataFrame({
+        "supplier_id": supplier_ids,
+        "name": company_names,
+        "country": pd.Categorical(supplier_countries, categories=countries),
+    })
+    return df, supplier_ids, dominance_scores
 
 # %% [markdown] id="LSJSk_O1LBiF"
 # # Generate Material Nodes
@@ -132,25 +144,55 @@ tier_names = {
     4: ["Lithium_Hydroxide", "Cobalt_Sulfate", "Nickel_Class1", "Graphite_Synth", "Copper_Foil"]
 }
 
-# %% colab={"base_uri": "https://localhost:8080/", "height": 206} id="0G7UgbkYLdTa" outputId="656ff1e5-825c-41e7-d460-4344cc5da0ae"
-materials = []
+# %% colab={"base_uri": "https://localhost:8080/", "height": 206} id="0G7UgbkYLdTa" outputId="656fe1f5-825c-41e7-d460-4344cc5da0ae"
+def build_materials(worker_seed):
+    # Runs in a worker process, so it seeds its own generator deterministically
+    worker_rng = np.random.default_rng(worker_seed)
 
-for i in range(NUM_MATERIALS):
-    tier = np.random.choice([0, 1, 2, 3, 4], p=TIER_DISTRIBUTION)
+    tiers = worker_rng.choice(len(TIER_DISTRIBUTION), size=NUM_MATERIALS, p=TIER_DISTRIBUTION)
 
-    # Semantic Naming
-    base_name = random.choice(tier_names[tier])
-    mat_id = f"MAT_T{tier}_{str(i+1).zfill(5)}"
+    # Vectorized id construction, e.g. MAT_T3_00042
+    material_ids = np.char.add(
+        np.char.add('MAT_T', tiers.astype('U1')),
+        np.char.add('_', np.char.zfill(np.arange(1, NUM_MATERIALS + 1).astype('U5'), 5))
+    )
 
-    materials.append({
-        "material_id": mat_id,
-        "description": base_name,
-        "tier_level": tier, # to be used for BOM hierarchy
-        "base_unit": "EA" if tier < 4 else "KG",
-        "cost_estimate": round(random.lognormvariate(3, 1) * (5 - tier), 2) # Higher tiers = more expensive
+    # Higher tiers = more expensive; one bulk lognormal draw for all materials
+    cost_estimates = np.round(worker_rng.lognormal(mean=3, sigma=1, size=NUM_MATERIALS) * (5 - tiers), 2)
+
+    # Semantic Naming: one batched name-variant draw per tier
+    descriptions = np.empty(NUM_MATERIALS, dtype=object)
+    for tier, names in tier_names.items():
+        in_tier = tiers == tier
+        descriptions[in_tier] = np.array(names, dtype=object)[worker_rng.integers(len(names), size=in_tier.sum())]
+
+    # Assemble straight from the column arrays, no per-row dicts; the
+    # low-cardinality columns become categoricals (8-bit codes plus one
+    # shared dictionary instead of a Python string object per row).
+    # tier_level and cost_estimate stay in the tiers / cost_estimates
+    # arrays: they only drive edge generation and are never exported
+    df = pd.DataFrame({
+        "material_id": material_ids,
+        "description": pd.Categorical(descriptions),
+        "base_unit": pd.Categorical(np.where(tiers < 4, "EA", "KG"), categories=["EA", "KG"]),
     })
+    return df, material_ids, tiers, cost_estimates
+
+# %% [markdown]
+# ## Run both node builders in parallel
+#
+# Supplier and material generation are independent of each other, so they can overlap on two worker processes. Each worker gets its own derived seed.
+
+# %% colab={"base_uri": "https://localhost:8080/", "height": 206} id="0G7UgbkYLdTb" outputId="656fe1f5-825c-41e7-d460-4344cc5da0af"
+# Fork keeps the notebook-defined functions importable in the workers
+with concurrent.futures.ProcessPoolExecutor(
+    max_workers=2, mp_context=multiprocessing.get_context("fork")
+) as executor:
+    future_suppliers = executor.submit(build_suppliers, seed + 1)
+    future_materials = executor.submit(build_materials, seed + 2)
+    df_suppliers, supplier_ids, dominance_scores = future_suppliers.result()
+    df_materials, material_ids, tiers, cost_estimates = future_materials.result()
 
-df_materials = pd.DataFrame(materials)
 df_materials.head()
 
 # %% [markdown] id="j-sNDHadM0d-"
@@ -165,41 +207,46 @@ df_materials.head()
 # * should quantity be whole number?
 
 # %% colab={"base_uri": "https://localhost:8080/", "height": 206} id="xcOSor_HNAqA" outputId="38b9bbdc-5344-4227-dcfb-680ad8c83d12"
-bom_edges = []
-# Group materials by tier for easy lookup
-mats_by_tier = df_materials.groupby("tier_level")["material_id"].apply(list).to_dict()
+bom_frames = []
+# Group material row positions by tier once for easy lookup: a stable sort
+# plus boundary search keeps the bucketing in NumPy instead of pandas
+# groupby machinery; the loop below works on integer indices throughout
+tier_order = np.argsort(tiers, kind='stable')
+tier_bounds = np.searchsorted(tiers[tier_order], np.arange(len(TIER_DISTRIBUTION) + 1))
+tier_indices = {t: tier_order[tier_bounds[t]:tier_bounds[t+1]] for t in range(len(TIER_DISTRIBUTION))}
 
 # Logic: Iterate through Tiers 0 to 3 and assign children from Tier N+1
 # We use a constrained random approach to ensure every item has children (except Raw Materials)
 for tier in range(4): # 0, 1, 2, 3
-    parents = mats_by_tier.get(tier, [])
-    potential_children = mats_by_tier.get(tier+1, [])
-
-    if not potential_children: continue
-
-    for parent in parents:
-        # Determine number of components (Fan-out)
-        # Complex items (Tier 0) have many components; Raw parents (Tier 3) have few
-        num_children = max(1, int(np.random.poisson(lam=4.0 - (tier * 0.5))))
-
-        # Select children
-        if tier == 3:
-            # Heavily biased selection for Raw Materials to create dependency hubs
-            children = np.random.choice(potential_children, size=num_children, replace=False)
-        else:
-            children = random.sample(potential_children, k=min(len(potential_children), num_children))
-
-        for child in children:
-            qty = round(random.uniform(1.0, 20.0), 2)
-            if tier == 3: qty = round(random.uniform(0.5, 5.0), 3) # KG for raw materials
-
-            bom_edges.append({
-                "parent_material_id": parent,
-                "child_material_id": child,
-                "quantity": qty,
-            })
-
-df_bom = pd.DataFrame(bom_edges)
+    parents = tier_indices[tier]
+    potential_children = tier_indices[tier+1]
+
+    if len(parents) == 0 or len(potential_children) == 0: continue
+
+    # Determine number of components (Fan-out), drawn for all parents at once
+    # Complex items (Tier 0) have many components; Raw parents (Tier 3) have few
+    fan_out = np.maximum(1, rng.poisson(lam=4.0 - (tier * 0.5), size=len(parents)))
+    fan_out = np.minimum(fan_out, len(potential_children))
+    total_edges = fan_out.sum()
+
+    # Select children in one bulk draw; sampling with replacement means a
+    # parent can rarely pick the same child twice, which is acceptable noise
+    child_pick = rng.integers(0, len(potential_children), total_edges)
+
+    if tier == 3:
+        quantities = np.round(rng.uniform(0.5, 5.0, total_edges), 3) # KG for raw materials
+    else:
+        quantities = np.round(rng.uniform(1.0, 20.0, total_edges), 2)
+
+    # Both id columns hold int32 material positions; the string ids are
+    # rendered once at export
+    bom_frames.append(pd.DataFrame({
+        "parent_material_id": np.repeat(parents, fan_out).astype(np.int32),
+        "child_material_id": potential_children[child_pick].astype(np.int32),
+        "quantity": quantities,
+    }))
+
+df_bom = pd.concat(bom_frames, ignore_index=True)
 df_bom.head()
 
 # %% [markdown] id="8ETJvEPtNy1a"
@@ -211,11 +258,6 @@ df_bom.head()
 #
 # ---
 
-# %% id="Yay1A7xIQaSf"
-order_records = []
-supplier_list = df_suppliers.to_dict('records')
-material_list = df_materials.to_dict('records')
-
 # %% [markdown] id="G_3yDb82N7jO"
 # ## Assign _Approved Supplier List_ (ASL)
 #
@@ -229,100 +271,124 @@ material_list = df_materials.to_dict('records')
 # * High capacity suppliers are more likely to be chosen (Preferential Attachment)
 
 # %% id="6KBhiF_kQItk"
-mat_supplier_map = {} # material_id -> list of possible supplier_ids
-
-# Iterate materials and assign 1-3 suppliers each
-for mat in material_list:
-    candidates = random.choices(
-        supplier_list,
-        weights=[s['capacity_score'] for s in supplier_list],
-        k=random.randint(1, 3) # Multi-sourcing
-    )
-    mat_supplier_map[mat['material_id']] = [s['supplier_id'] for s in candidates]
+# Precompute the cumulative capacity weights once instead of rebuilding
+# the 3000-element weight list for every material
+capacity_cdf = np.cumsum(dominance_scores.astype(np.float64))
+capacity_cdf /= capacity_cdf[-1]
+
+# Assign 1-3 suppliers per material (Multi-sourcing)
+suppliers_per_mat = rng.integers(1, 4, NUM_MATERIALS)
+# One batched weighted draw via inverse-CDF sampling
+asl_flat = np.searchsorted(capacity_cdf, rng.random(suppliers_per_mat.sum()), side='right')
+
+# Ragged material -> supplier mapping: the supplier indices for material m
+# sit in asl_flat[asl_offsets[m]:asl_offsets[m+1]]
+asl_offsets = np.concatenate(([0], np.cumsum(suppliers_per_mat)))
 
 # %% [markdown] id="QjfBU0PTQzGn"
 # ## Generate POs based on relationships
 #
 # Status is used to differentiate between historic data and current exposure.
+#
+# - Fully batch-vectorized; a Numba `@njit` loop would be the alternative if the exact per-iteration RNG call order ever had to be preserved, but that would add a compile-time dependency for no gain here.
 
 # %% id="d8PwPzpPQ8v8"
-current_po_count = 0
-po_id_counter = 100000
-current_date = date(2025, 10, 31)
-
-while current_po_count < TARGET_PO_COUNT:
-    # Pick a random material
-    mat = random.choice(material_list)
-    # Pick one of its valid suppliers
-    valid_suppliers = mat_supplier_map[mat['material_id']]
-    supplier_id = random.choice(valid_suppliers)
-
-    # Generate Date
-    po_date = fake.date_between(start_date=date(2024, 1, 1), end_date=date(2025, 12, 31))
-    lead_time = random.randint(14, 90)
-    due_date = po_date + timedelta(days=lead_time)
-
-    # Pareto Volume: 20% of orders get 80% of volume
-    is_bulk = random.random() < 0.20
-    quantity_ordered = int(np.random.pareto(a=1.16) * 50) + 1 if is_bulk else random.randint(1, 100)
-
-    if due_date > current_date: # Open order
-        quantity_received = 0
-        receipt_date = None
-    else:
-        fulfillment_status = np.random.choice(["Full", "Partial", "Missing"], p=[0.85, 0.10, 0.05])
-
-        if fulfillment_status == "Full":
-            quantity_received = quantity_ordered
-            # Receipt happened -2 to +10 days around due date
-            receipt_date = due_date + timedelta(days=random.randint(-2, 10))
-        elif fulfillment_status == "Partial":
-            quantity_received = int(quantity_ordered * random.uniform(0.1, 0.9))
-            receipt_date = due_date + timedelta(days=random.randint(1, 15))
-        else: # Missing
-            quantity_received = 0
-            receipt_date = None
-
-    # Unit Price with some noise
-    unit_price = mat['cost_estimate'] * random.uniform(0.95, 1.05)
-
-    order_records.append({
-        "po_id": f"PO-{po_id_counter}", # Unique line ID
-        "supplier_id": supplier_id,
-        "material_id": mat['material_id'],
-        "order_date": po_date,
-        "due_date": due_date,
-        "receipt_date": receipt_date,
-        "quantity_ordered": quantity_ordered,
-        "quantity_received": quantity_received,
-        "unit_price": round(unit_price, 2),
-    })
-
-    po_id_counter += 1
-    current_po_count += 1
+current_date = np.datetime64('2025-10-31')
+po_start_date = np.datetime64('2024-01-01')
+
+# Pick a random material for every PO in a single batch draw
+mat_idx = rng.integers(0, NUM_MATERIALS, TARGET_PO_COUNT)
+# Pick one of its valid suppliers: a uniform within-list offset per PO,
+# resolved through the ragged ASL arrays in a few vector ops
+po_sup_idx = asl_flat[asl_offsets[mat_idx] + rng.integers(0, suppliers_per_mat[mat_idx])]
+
+# Generate Dates (731 day span keeps 2025-12-31 reachable)
+po_dates = po_start_date + rng.integers(0, 731, TARGET_PO_COUNT).astype('timedelta64[D]')
+lead_times = rng.integers(14, 91, TARGET_PO_COUNT)
+due_dates = po_dates + lead_times.astype('timedelta64[D]')
+
+# Pareto Volume: 20% of orders get 80% of volume
+is_bulk = rng.random(TARGET_PO_COUNT) < 0.20
+bulk_qty = (rng.pareto(a=1.16, size=TARGET_PO_COUNT) * 50).astype(int) + 1
+quantity_ordered = np.where(is_bulk, bulk_qty, rng.integers(1, 101, TARGET_PO_COUNT))
+
+is_open = due_dates > current_date # Open orders have no receipt yet
+# Integer-form choice skips re-coercing the label list: 0=Full, 1=Partial, 2=Missing
+fulfillment_status = rng.choice(3, size=TARGET_PO_COUNT, p=[0.85, 0.10, 0.05])
+is_full = ~is_open & (fulfillment_status == 0)
+is_partial = ~is_open & (fulfillment_status == 1)
+
+quantity_received = np.select(
+    [is_full, is_partial],
+    [quantity_ordered, (quantity_ordered * rng.uniform(0.1, 0.9, TARGET_PO_COUNT)).astype(int)],
+    default=0 # Missing or still open
+)
+
+# Receipt happened -2 to +10 days around due date (Full) or 1 to 15 days late (Partial)
+receipt_offsets = np.where(is_full, rng.integers(-2, 11, TARGET_PO_COUNT), rng.integers(1, 16, TARGET_PO_COUNT))
+receipt_dates = due_dates + receipt_offsets.astype('timedelta64[D]')
+# Open and missing orders have no receipt; NaT serializes to an empty CSV field
+receipt_dates = np.where(is_full | is_partial, receipt_dates, np.datetime64('NaT'))
+
+# Unit Price with some noise
+unit_prices = np.round(cost_estimates[mat_idx] * rng.uniform(0.95, 1.05, TARGET_PO_COUNT), 2)
+
+df_po = pd.DataFrame({
+    "po_id": np.char.add('PO-', (100000 + np.arange(TARGET_PO_COUNT)).astype('U6')), # Unique line ID
+    "supplier_id": po_sup_idx.astype(np.int32), # positional FKs, rendered as strings at export
+    "material_id": mat_idx.astype(np.int32),
+    "order_date": po_dates,
+    "due_date": due_dates,
+    "receipt_date": receipt_dates,
+    "quantity_ordered": quantity_ordered,
+    "quantity_received": quantity_received,
+    "unit_price": unit_prices,
+})
 
 # %% colab={"base_uri": "https://localhost:8080/", "height": 226} id="1HGC134xRAjw" outputId="532d29c7-e5f4-4815-9429-b69c8ed88173"
-df_po = pd.DataFrame(order_records)
 df_po.head()
 
 # %% [markdown] id="bBGHOhdZRUN3"
 # # Export
 
-# %% [markdown]
-# Remove explicit columns used for edge generation.
-
-# %%
-df_suppliers = df_suppliers.drop(columns=['capacity_score'])
-df_materials = df_materials.drop(columns=['cost_estimate', 'tier_level'])
-
 # %% colab={"base_uri": "https://localhost:8080/"} id="wx79jTVDRhBd" outputId="3664da5f-aee8-4aa0-b7a0-219d0164a499"
 parent_folder = "data-gen"
 subfolder = "data"
-os.makedirs(subfolder, exist_ok=True)
-df_suppliers.to_csv(f"./{parent_folder}/{subfolder}/suppliers.csv", index=False)
-df_materials.to_csv(f"./{parent_folder}/{subfolder}/materials.csv", index=False)
-df_bom.to_csv(f"./{parent_folder}/{subfolder}/bom_relationships.csv", index=False)
-df_po.to_csv(f"./{parent_folder}/{subfolder}/order_records.csv", index=False)
+os.makedirs(f"./{parent_folder}/{subfolder}", exist_ok=True)
+
+def write_csv(df, filename):
+    # Pandas ops can hand back strided/Fortran-ordered blocks, which degrade
+    # the serialization pass; repack any such column before writing
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if isinstance(values, np.ndarray) and not values.flags.c_contiguous:
+            df[col] = np.ascontiguousarray(values)
+
+    # Arrow's CSV writer formats typed columns in multithreaded C code;
+    # date columns are cast to date32 to keep the plain YYYY-MM-DD format
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    fields = [pa.field(f.name, pa.date32()) if pa.types.is_timestamp(f.type) else f for f in table.schema]
+    pacsv.write_csv(
+        table.cast(pa.schema(fields)),
+        f"./{parent_folder}/{subfolder}/{filename}",
+        write_options=pacsv.WriteOptions(quoting_style='needed')
+    )
+
+# The fact tables carry int32 positional FKs in memory; swap in the string
+# ids only now so the CSV schema stays unchanged
+df_bom_out = df_bom.assign(
+    parent_material_id=material_ids[df_bom['parent_material_id'].to_numpy()],
+    child_material_id=material_ids[df_bom['child_material_id'].to_numpy()],
+)
+df_po_out = df_po.assign(
+    supplier_id=supplier_ids[df_po['supplier_id'].to_numpy()],
+    material_id=material_ids[df_po['material_id'].to_numpy()],
+)
+
+write_csv(df_suppliers, "suppliers.csv")
+write_csv(df_materials, "materials.csv")
+write_csv(df_bom_out, "bom_relationships.csv")
+write_csv(df_po_out, "order_records.csv")
 
 print("Done! Files generated:")
 print(f" - suppliers.csv ({len(df_suppliers)} rows)")